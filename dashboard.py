@@ -3,6 +3,10 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
+import os
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
 
 # Page configuration
 st.set_page_config(page_title="Art Basel Hong Kong - Sales Analysis", layout="wide")
@@ -14,159 +18,336 @@ This dashboard analyses art transactions at one of Asia's most important fairs.
 Explore market trends, featured artists and price distribution.
 """)
 
+# Source data and its Feather copy (written on first load, memory-mapped on cold starts);
+# the copy is only checked against the CSV's mtime, so bump its version whenever the parse changes
+DATA_FILE = 'sales.csv'
+FEATHER_FILE = 'sales.v2.feather'
+
+# Declared CSV column types (Year is free text such as "1920s" and is coerced after loading)
+CSV_COLUMN_TYPES = {'Minimum Price': pa.float32(), 'Maximum Price': pa.float32(), 'Year': pa.string()}
+
+# Cells read as missing (pandas.read_csv's defaults, blanks included)
+CSV_NULL_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+# Repeated string columns stored as pandas categoricals
+CATEGORY_COLUMNS = ['Artist', 'Gallery', 'Country', 'Artist Type', 'Sales Status']
+
+# Layout shared by the single-series bar charts
+BAR_LAYOUT = dict(height=400, showlegend=False)
+
+# Client-side number formats for st.dataframe tables
+MONEY_COLUMN = st.column_config.NumberColumn(format='$%.2f')
+COUNT_COLUMN = st.column_config.NumberColumn(format='%d')
+RATIO_COLUMN = st.column_config.NumberColumn(format='%.2f')
+PERCENT_COLUMN = st.column_config.NumberColumn(format='%.1f%%')
+
+# Scatter plots label every point below SCATTER_LABEL_ALL points, otherwise
+# only the top SCATTER_LABELS by total value
+SCATTER_LABEL_ALL = 50
+SCATTER_LABELS = 20
+
 # Load data
-@st.cache_data
+def read_sales():
+    # Reuse the Feather copy unless the CSV has been modified since it was written
+    if os.path.exists(FEATHER_FILE) and os.path.getmtime(FEATHER_FILE) >= os.path.getmtime(DATA_FILE):
+        return feather.read_table(FEATHER_FILE, memory_map=True).to_pandas()
+    table = pacsv.read_csv(
+        DATA_FILE,
+        convert_options=pacsv.ConvertOptions(
+            column_types=CSV_COLUMN_TYPES,
+            null_values=CSV_NULL_VALUES,
+            strings_can_be_null=True
+        )
+    )
+    df = table.to_pandas()
+    # Stored dictionary-encoded, so Feather loads return these as categoricals directly
+    # (converted in pandas so the categories come out sorted)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    # Best effort: write to a temp file and swap it in, so readers never map a partial file;
+    # a read-only app directory just means the next cold start parses the CSV again
+    tmp_file = f'{FEATHER_FILE}.{os.getpid()}.tmp'
+    try:
+        feather.write_feather(df, tmp_file)
+        os.replace(tmp_file, FEATHER_FILE)
+    except OSError:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return df
+
+# Cached as a shared resource (no copy per rerun); the frame must be treated as read-only
+@st.cache_resource
 def load_data():
-    df = pd.read_csv('sales.csv')
-    df['Average Price'] = (df['Minimum Price'] + df['Maximum Price']) / 2
+    df = read_sales()
+    # Prices are kept in float32 (dollar totals are accumulated in float64);
+    # the average is written into one preallocated buffer
+    min_prices = df['Minimum Price'].to_numpy(dtype=np.float32)
+    max_prices = df['Maximum Price'].to_numpy(dtype=np.float32)
+    average_prices = np.empty_like(min_prices)
+    np.add(min_prices, max_prices, out=average_prices)
+    average_prices *= 0.5
+    df['Average Price'] = average_prices
     
-    # Create updated price ranges
-    df['Price Range'] = pd.cut(
-        df['Average Price'],
-        bins=[0, 10000, 50000, 200000, float('inf')],
-        labels=['< $10K', '$10K - $50K', '$50K - $200K', '$200K+']
+    # Create updated price ranges and quartile-based price segments
+    # (right-inclusive bins, equivalent to pd.cut / pd.qcut); edges share the
+    # prices' dtype so searchsorted does not upcast the whole column
+    prices = df['Average Price'].to_numpy()
+    range_edges = np.array([10000, 50000, 200000], dtype=prices.dtype)
+    range_codes = np.searchsorted(range_edges, prices).astype(np.int8)
+    range_codes[~(prices > 0)] = -1
+    df['Price Range'] = pd.Categorical.from_codes(
+        range_codes,
+        categories=['< $10K', '$10K - $50K', '$50K - $200K', '$200K+'],
+        ordered=True
+    )
+    segment_edges = np.nanquantile(prices, [0.25, 0.5, 0.75]).astype(prices.dtype)
+    segment_codes = np.searchsorted(segment_edges, prices).astype(np.int8)
+    segment_codes[np.isnan(prices)] = -1
+    df['Price Segment'] = pd.Categorical.from_codes(
+        segment_codes,
+        categories=['Basic', 'Medium', 'Premium', 'Ultra Premium'],
+        ordered=True
     )
     
-    # Calculate additional metrics per artist
-    artist_metrics = df.groupby('Artist').agg({
-        'Average Price': 'sum',
-        'Artist': 'count'
-    }).rename(columns={'Artist': 'Works per Artist'})
-    df['Average Works per Artist'] = len(df) / len(artist_metrics)
+    # Catalogue sizes (scalars, kept out of the frame)
+    counts = {
+        'works': len(df),
+        'artists': df['Artist'].nunique(),
+        'galleries': df['Gallery'].nunique(),
+    }
     
-    # Calculate metrics per gallery
-    gallery_metrics = df.groupby('Gallery').agg({
-        'Average Price': 'sum',
-        'Gallery': 'count'
-    }).rename(columns={'Gallery': 'Works per Gallery'})
-    df['Average Works per Gallery'] = len(df) / len(gallery_metrics)
+    # Normalise year
+    df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
     
-    return df
+    return df, counts
 
-df = load_data()
+# Cached aggregations (recomputed only when the data changes, not on every rerun)
+@st.cache_data
+def compute_summary(df):
+    # Single pass over the price column (work/artist/gallery counts come from load_data)
+    price_stats = df['Average Price'].agg(['mean', 'median', 'min', 'max', 'std'])
+    return {
+        'total': np.nansum(df['Average Price'].to_numpy(), dtype=np.float64),
+        'mean': price_stats['mean'],
+        'median': price_stats['median'],
+        'min': price_stats['min'],
+        'max': price_stats['max'],
+        'std': price_stats['std'],
+    }
 
-# Main KPIs Section
-st.header("📊 Key Market Metrics")
+def group_codes(values):
+    # Integer group codes (-1 for missing) and their labels; categoricals reuse their codes
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values, sort=True)
 
-# First row of KPIs - General Metrics
-col1, col2, col3, col4 = st.columns(4)
-with col1:
-    st.metric("Total Works", f"{len(df):,}")
-with col2:
-    st.metric("Total Artists", f"{df['Artist'].nunique():,}")
-with col3:
-    st.metric("Total Galleries", f"{df['Gallery'].nunique():,}")
-with col4:
-    st.metric("Total Volume", f"${df['Average Price'].sum():,.0f}")
+def count_unique(values, mask):
+    # Distinct non-missing values among the masked rows, counted on integer codes
+    codes = group_codes(values)[0][mask]
+    return np.unique(codes[codes >= 0]).size
 
-# Second row - Price Metrics
-col5, col6, col7, col8 = st.columns(4)
-with col5:
-    st.metric("Average Price", f"${df['Average Price'].mean():,.0f}")
-with col6:
-    st.metric("Median Price", f"${df['Average Price'].median():,.0f}")
-with col7:
-    st.metric("Minimum Price", f"${df['Average Price'].min():,.0f}")
-with col8:
-    st.metric("Maximum Price", f"${df['Average Price'].max():,.0f}")
+def category_mask(values, selected):
+    # Membership test on integer category codes against the selected categories' codes
+    selected_codes = values.cat.categories.get_indexer(selected)
+    return np.isin(values.cat.codes.to_numpy(), selected_codes[selected_codes >= 0])
 
-# Third row - Dispersion Metrics and Ratios
-col9, col10, col11, col12 = st.columns(4)
-with col9:
-    st.metric("Standard Deviation", f"${df['Average Price'].std():,.0f}")
-with col10:
-    works_per_artist = len(df) / df['Artist'].nunique()
-    st.metric("Works per Artist", f"{works_per_artist:.1f}")
-with col11:
-    works_per_gallery = len(df) / df['Gallery'].nunique()
-    st.metric("Works per Gallery", f"{works_per_gallery:.1f}")
-with col12:
-    value_per_work = df['Average Price'].sum() / len(df)
-    st.metric("Value per Work", f"${value_per_work:,.0f}")
+def aggregate_groups(df, key, unique_cols, observed=True):
+    # Price sum/mean/size and distinct counts per group, each a single bincount over integer codes
+    # (bincount accumulates the float32 prices in float64, so dollar totals stay exact);
+    # observed=False keeps empty groups, with a NaN mean; missing prices are skipped
+    # in the price statistics, as pandas does, but still count towards the distinct counts
+    codes, labels = group_codes(df[key])
+    valid = codes >= 0
+    codes = codes[valid]
+    prices = df['Average Price'].to_numpy()[valid]
+    priced = ~np.isnan(prices)
+    ngroups = len(labels)
+    size = np.bincount(codes[priced], minlength=ngroups)
+    total = np.bincount(codes[priced], weights=prices[priced], minlength=ngroups)
+    keep = np.bincount(codes, minlength=ngroups) > 0 if observed else np.ones(ngroups, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        mean = total[keep] / size[keep]
+    result = pd.DataFrame(
+        {'sum': total[keep], 'mean': mean, 'size': size[keep]},
+        index=pd.Index(labels[keep], name=key)
+    )
+    for col in unique_cols:
+        other_codes, other_labels = group_codes(df[col])
+        other_codes = other_codes[valid]
+        present = other_codes >= 0
+        pairs = np.unique(codes[present].astype(np.int64) * len(other_labels) + other_codes[present])
+        result[col] = np.bincount(pairs // len(other_labels), minlength=ngroups)[keep]
+    return result
 
-# Price Distribution
-st.subheader("📈 Price Distribution")
-# Create histogram with plotly
-fig_histogram = go.Figure(data=[go.Histogram(
-    x=df['Average Price'],
-    nbinsx=30,
-    name='Number of Works',
-    hovertemplate="Price Range: $%{x:,.0f}<br>Number of Works: %{y}"
-)])
-
-fig_histogram.update_layout(
-    title="Distribution of Works by Price Range",
-    xaxis_title="Work Price ($)",
-    yaxis_title="Number of Works",
-    bargap=0.1,
-    showlegend=False
-)
-
-# Add vertical lines for mean and median
-fig_histogram.add_vline(
-    x=df['Average Price'].mean(),
-    line_dash="dash",
-    line_color="red",
-    annotation_text="Average Price",
-    annotation_position="top"
-)
-fig_histogram.add_vline(
-    x=df['Average Price'].median(),
-    line_dash="dash",
-    line_color="green",
-    annotation_text="Median Price",
-    annotation_position="bottom"
-)
+@st.cache_data
+def compute_gallery_metrics(df):
+    gallery_metrics = aggregate_groups(df, 'Gallery', ['Artist']).round(2)
+    gallery_metrics.columns = ['Total Value', 'Average Price', 'Number of Works', 'Number of Artists']
+    gallery_metrics['Works per Artist'] = (gallery_metrics['Number of Works'] / gallery_metrics['Number of Artists']).round(2)
+    return gallery_metrics
 
-st.plotly_chart(fig_histogram, use_container_width=True)
+@st.cache_data
+def compute_artist_metrics(df):
+    artist_metrics = aggregate_groups(df, 'Artist', ['Gallery']).round(2)
+    artist_metrics.columns = ['Total Value', 'Average Price', 'Number of Works', 'Number of Galleries']
+    return artist_metrics
 
-# Gallery Analysis
-st.header("🏢 Gallery Analysis")
+@st.cache_data
+def compute_year_stats(df):
+    year_stats = aggregate_groups(df, 'Year', ['Artist', 'Gallery']).round(2)
+    year_stats = year_stats[['mean', 'sum', 'size', 'Artist', 'Gallery']]
+    year_stats.columns = ['Average Price', 'Total Value', 'Number of Works', 'Number of Artists', 'Number of Galleries']
+    return year_stats
 
-# Prepare aggregated gallery data (once)
-gallery_metrics = df.groupby('Gallery').agg({
-    'Average Price': ['sum', 'mean', 'count'],
-    'Artist': 'nunique'
-}).round(2)
-gallery_metrics.columns = ['Total Value', 'Average Price', 'Number of Works', 'Number of Artists']
-gallery_metrics['Works per Artist'] = (gallery_metrics['Number of Works'] / gallery_metrics['Number of Artists']).round(2)
-gallery_metrics = gallery_metrics.sort_values('Total Value', ascending=False)
+def price_group_stats(df, key, unique_cols=(), observed=True):
+    # Number of Works / Average Price / Total Value per group, followed by the distinct counts
+    stats = aggregate_groups(df, key, list(unique_cols), observed)
+    return stats.rename(columns={'size': 'Number of Works', 'mean': 'Average Price', 'sum': 'Total Value'})[
+        ['Number of Works', 'Average Price', 'Total Value', *unique_cols]
+    ]
 
-# Main gallery visualisations
-col1, col2 = st.columns(2)
+@st.cache_data
+def compute_segment_stats(df):
+    segment_stats = price_group_stats(df, 'Price Segment', observed=False).round(2)
+    
+    # Calculate percentages
+    segment_stats['% Works'] = (segment_stats['Number of Works'] / segment_stats['Number of Works'].sum()) * 100
+    segment_stats['% Value'] = (segment_stats['Total Value'] / segment_stats['Total Value'].sum()) * 100
+    return segment_stats
 
-with col1:
-    st.subheader("💰 Top 10 Galleries by Total Value")
+@st.cache_data
+def compute_region_stats(df):
+    region_stats = price_group_stats(df, 'Country', ['Artist', 'Gallery']).rename(
+        columns={'Artist': 'Number of Artists', 'Gallery': 'Number of Galleries'}
+    ).round(2)
+    region_stats['% Value'] = (region_stats['Total Value'] / region_stats['Total Value'].sum()) * 100
+    return region_stats
+
+@st.cache_data
+def compute_artist_type_stats(df):
+    artist_type_stats = price_group_stats(df, 'Artist Type', ['Artist']).rename(
+        columns={'Artist': 'Number of Artists'}
+    ).round(2)
+    artist_type_stats['% Value'] = (artist_type_stats['Total Value'] / artist_type_stats['Total Value'].sum()) * 100
+    return artist_type_stats
+
+@st.cache_data
+def compute_sales_stats(df):
+    return price_group_stats(df, 'Sales Status').round(2)
+
+@st.cache_data
+def compute_premium_stats(df):
+    # Top-10% works by price, from a boolean mask on the price array (no row copy);
+    # missing prices are ignored by the quantile and never pass the comparison
+    prices = df['Average Price'].to_numpy()
+    premium_mask = prices > np.nanquantile(prices, 0.9)
+    count = int(premium_mask.sum())
+    total = prices[premium_mask].sum(dtype=np.float64)
+    return {'count': count, 'total': total, 'mean': total / count if count else 0.0}
+
+@st.cache_data
+def filter_options(df):
+    # Category lists are already sorted and unique, so they feed the filters directly
+    return {
+        col: df[col].cat.categories.tolist()
+        for col in CATEGORY_COLUMNS + ['Price Segment']
+        if col in df.columns
+    }
+
+@st.cache_data
+def compute_histogram(values, bins):
+    # Bin server-side so the browser receives one bar per bin instead of every value;
+    # float32 is plenty for bar positions and halves the data np.histogram scans
+    counts, edges = np.histogram(values.dropna().to_numpy(dtype=np.float32), bins=bins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    bin_ranges = np.column_stack((edges[:-1], edges[1:]))
+    return centers, counts, np.diff(edges), bin_ranges
+
+@st.cache_data
+def compute_count_histogram(values, max_bins):
+    # Integer-aligned bins for count data: each bar covers whole numbers only,
+    # merging consecutive values once there are more than max_bins of them
+    values = values.dropna().to_numpy(dtype=np.int64)
+    lo, hi = int(values.min()), int(values.max())
+    step = -(-(hi - lo + 1) // max_bins)
+    starts = np.arange(lo, hi + 1, step)
+    ends = np.minimum(starts + step - 1, hi)
+    counts = np.bincount((values - lo) // step, minlength=len(starts))
+    labels = [str(a) if a == b else f'{a} - {b}' for a, b in zip(starts, ends)]
+    return (starts + ends) / 2, counts, ends - starts + 1, labels
+
+# Figure builders (cached: none of the charts depend on the filter widgets)
+@st.cache_resource
+def make_price_histogram_fig(price_centers, price_counts, price_widths, price_ranges, summary):
+    fig_histogram = go.Figure(data=[go.Bar(
+        x=price_centers,
+        y=price_counts,
+        width=price_widths,
+        customdata=price_ranges,
+        name='Number of Works',
+        hovertemplate="Price Range: $%{customdata[0]:,.0f} - $%{customdata[1]:,.0f}<br>Number of Works: %{y}"
+    )])
+
+    fig_histogram.update_layout(
+        title="Distribution of Works by Price Range",
+        xaxis_title="Work Price ($)",
+        yaxis_title="Number of Works",
+        bargap=0.1,
+        showlegend=False
+    )
+
+    # Add vertical lines for mean and median
+    fig_histogram.add_vline(
+        x=summary['mean'],
+        line_dash="dash",
+        line_color="red",
+        annotation_text="Average Price",
+        annotation_position="top"
+    )
+    fig_histogram.add_vline(
+        x=summary['median'],
+        line_dash="dash",
+        line_color="green",
+        annotation_text="Median Price",
+        annotation_position="bottom"
+    )
+    return fig_histogram
+
+@st.cache_resource
+def make_top_galleries_fig(top_galleries):
     fig_top_galleries = go.Figure(data=[
         go.Bar(
-            x=gallery_metrics['Total Value'].head(10).index,
-            y=gallery_metrics['Total Value'].head(10),
-            text=gallery_metrics['Total Value'].head(10).apply(lambda x: f'${x:,.0f}'),
+            x=top_galleries.index,
+            y=top_galleries['Total Value'],
+            texttemplate='$%{y:,.0f}',
             textposition='auto',
         )
     ])
     fig_top_galleries.update_layout(
         xaxis_title="Gallery",
         yaxis_title="Total Value ($)",
-        showlegend=False,
-        height=400
+        **BAR_LAYOUT
     )
-    st.plotly_chart(fig_top_galleries, use_container_width=True)
+    return fig_top_galleries
 
-with col2:
-    st.subheader("📊 Works and Artists per Gallery")
+@st.cache_resource
+def make_works_artists_fig(top_galleries):
     fig_works_artists = go.Figure(data=[
         go.Bar(
             name='Works',
-            x=gallery_metrics['Number of Works'].head(10).index,
-            y=gallery_metrics['Number of Works'].head(10),
-            text=gallery_metrics['Number of Works'].head(10).apply(lambda x: f'{x:,.0f}'),
+            x=top_galleries.index,
+            y=top_galleries['Number of Works'],
+            texttemplate='%{y:,.0f}',
         ),
         go.Bar(
             name='Artists',
-            x=gallery_metrics['Number of Artists'].head(10).index,
-            y=gallery_metrics['Number of Artists'].head(10),
-            text=gallery_metrics['Number of Artists'].head(10).apply(lambda x: f'{x:,.0f}'),
+            x=top_galleries.index,
+            y=top_galleries['Number of Artists'],
+            texttemplate='%{y:,.0f}',
         )
     ])
     fig_works_artists.update_layout(
@@ -175,210 +356,144 @@ with col2:
         yaxis_title="Quantity",
         height=400
     )
-    st.plotly_chart(fig_works_artists, use_container_width=True)
-
-# Gallery summary metrics
-col3, col4, col5, col6 = st.columns(4)
-with col3:
-    st.metric("Average Works/Gallery", f"{gallery_metrics['Number of Works'].mean():.1f}")
-with col4:
-    st.metric("Average Artists/Gallery", f"{gallery_metrics['Number of Artists'].mean():.1f}")
-with col5:
-    st.metric("Average Value/Gallery", f"${gallery_metrics['Total Value'].mean():,.0f}")
-with col6:
-    st.metric("Average Works/Artist", f"{gallery_metrics['Works per Artist'].mean():.1f}")
+    return fig_works_artists
 
-# Scatter plot of Works vs Total Value relationship
-st.subheader("📈 Relationship between Number of Works and Total Value")
-fig_scatter = go.Figure(data=[
-    go.Scatter(
-        x=gallery_metrics['Number of Works'],
-        y=gallery_metrics['Total Value'],
-        mode='markers+text',
-        text=gallery_metrics.index,
-        textposition="top center",
-        hovertemplate="<b>%{text}</b><br>" +
-                      "Number of Works: %{x}<br>" +
-                      "Total Value: $%{y:,.0f}<br>",
-        marker=dict(
-            size=10,
-            color=gallery_metrics['Average Price'],
-            colorscale='Viridis',
-            showscale=True,
-            colorbar=dict(title="Average Price ($)")
+@st.cache_resource
+def make_gallery_scatter_fig(gallery_metrics):
+    if len(gallery_metrics) < SCATTER_LABEL_ALL:
+        top_labeled_galleries = gallery_metrics
+    else:
+        top_labeled_galleries = gallery_metrics.nlargest(SCATTER_LABELS, 'Total Value')
+    fig_scatter = go.Figure(data=[
+        go.Scattergl(
+            x=gallery_metrics['Number of Works'],
+            y=gallery_metrics['Total Value'],
+            mode='markers',
+            text=gallery_metrics.index,
+            hovertemplate="<b>%{text}</b><br>" +
+                          "Number of Works: %{x}<br>" +
+                          "Total Value: $%{y:,.0f}<br>",
+            marker=dict(
+                size=10,
+                color=gallery_metrics['Average Price'],
+                colorscale='Viridis',
+                showscale=True,
+                colorbar=dict(title="Average Price ($)")
+            )
+        ),
+        go.Scattergl(
+            x=top_labeled_galleries['Number of Works'],
+            y=top_labeled_galleries['Total Value'],
+            mode='text',
+            text=top_labeled_galleries.index,
+            textposition="top center",
+            hoverinfo='skip'
         )
+    ])
+    fig_scatter.update_layout(
+        height=500,
+        xaxis_title="Number of Works",
+        yaxis_title="Total Value ($)",
+        showlegend=False
     )
-])
-fig_scatter.update_layout(
-    height=500,
-    xaxis_title="Number of Works",
-    yaxis_title="Total Value ($)",
-)
-st.plotly_chart(fig_scatter, use_container_width=True)
-
-# Detailed table in expander
-with st.expander("📋 View Complete Gallery Details"):
-    st.dataframe(
-        gallery_metrics.style.format({
-            'Total Value': '${:,.2f}',
-            'Average Price': '${:,.2f}',
-            'Number of Works': '{:,.0f}',
-            'Number of Artists': '{:,.0f}',
-            'Works per Artist': '{:,.2f}'
-        }),
-        height=400
-    )
-
-# Artist Analysis
-st.header("👨‍🎨 Artist Analysis")
-
-# Prepare aggregated artist data
-artist_metrics = df.groupby('Artist').agg({
-    'Average Price': ['sum', 'mean', 'count'],
-    'Gallery': 'nunique'
-}).round(2)
-artist_metrics.columns = ['Total Value', 'Average Price', 'Number of Works', 'Number of Galleries']
-artist_metrics = artist_metrics.sort_values('Total Value', ascending=False)
-
-# Artist summary metrics
-col_a1, col_a2, col_a3, col_a4 = st.columns(4)
-with col_a1:
-    st.metric("Average Works/Artist", f"{artist_metrics['Number of Works'].mean():.1f}")
-with col_a2:
-    st.metric("Average Galleries/Artist", f"{artist_metrics['Number of Galleries'].mean():.1f}")
-with col_a3:
-    st.metric("Average Value/Artist", f"${artist_metrics['Total Value'].mean():,.0f}")
-with col_a4:
-    artists_exclusive = len(artist_metrics[artist_metrics['Number of Galleries'] == 1])
-    st.metric("Exclusive Artists", f"{artists_exclusive:,}")
+    return fig_scatter
 
-# Main artist visualisations
-col_a5, col_a6 = st.columns(2)
-
-with col_a5:
-    st.subheader("💰 Top 10 Artists by Total Value")
+@st.cache_resource
+def make_top_artists_fig(top_artists):
     fig_top_artists = go.Figure(data=[
         go.Bar(
-            x=artist_metrics['Total Value'].head(10).index,
-            y=artist_metrics['Total Value'].head(10),
-            text=artist_metrics['Total Value'].head(10).apply(lambda x: f'${x:,.0f}'),
+            x=top_artists.index,
+            y=top_artists['Total Value'],
+            texttemplate='$%{y:,.0f}',
             textposition='auto',
         )
     ])
     fig_top_artists.update_layout(
         xaxis_title="Artist",
         yaxis_title="Total Value ($)",
-        showlegend=False,
-        height=400
+        **BAR_LAYOUT
     )
-    st.plotly_chart(fig_top_artists, use_container_width=True)
+    return fig_top_artists
 
-with col_a6:
-    st.subheader("📊 Distribution of Works per Artist")
-    fig_works_per_artist = go.Figure(data=[go.Histogram(
-        x=artist_metrics['Number of Works'],
-        nbinsx=20,
+@st.cache_resource
+def make_works_per_artist_fig(works_centers, works_counts, works_widths, works_labels):
+    fig_works_per_artist = go.Figure(data=[go.Bar(
+        x=works_centers,
+        y=works_counts,
+        width=works_widths,
+        customdata=works_labels,
         name='Number of Artists',
-        hovertemplate="Works: %{x}<br>Number of Artists: %{y}"
+        hovertemplate="Works: %{customdata}<br>Number of Artists: %{y}"
     )])
     fig_works_per_artist.update_layout(
         xaxis_title="Number of Works",
         yaxis_title="Number of Artists",
-        showlegend=False,
-        height=400
+        **BAR_LAYOUT
     )
-    st.plotly_chart(fig_works_per_artist, use_container_width=True)
+    return fig_works_per_artist
 
-# Scatter plot of Works vs Total Value relationship for artists
-st.subheader("📈 Relationship between Number of Works and Total Value per Artist")
-fig_scatter_artist = go.Figure(data=[
-    go.Scatter(
-        x=artist_metrics['Number of Works'],
-        y=artist_metrics['Total Value'],
-        mode='markers',
-        text=artist_metrics.index,
-        hovertemplate="<b>%{text}</b><br>" +
-                     "Number of Works: %{x}<br>" +
-                     "Total Value: $%{y:,.0f}<br>" +
-                     "Average Price: $%{marker.color:,.0f}<br>",
-        marker=dict(
-            size=10,
-            color=artist_metrics['Average Price'],
-            colorscale='Viridis',
-            showscale=True,
-            colorbar=dict(title="Average Price ($)")
+@st.cache_resource
+def make_artist_scatter_fig(artist_metrics):
+    if len(artist_metrics) < SCATTER_LABEL_ALL:
+        top_labeled_artists = artist_metrics
+    else:
+        top_labeled_artists = artist_metrics.nlargest(SCATTER_LABELS, 'Total Value')
+    fig_scatter_artist = go.Figure(data=[
+        go.Scattergl(
+            x=artist_metrics['Number of Works'],
+            y=artist_metrics['Total Value'],
+            mode='markers',
+            text=artist_metrics.index,
+            hovertemplate="<b>%{text}</b><br>" +
+                         "Number of Works: %{x}<br>" +
+                         "Total Value: $%{y:,.0f}<br>" +
+                         "Average Price: $%{marker.color:,.0f}<br>",
+            marker=dict(
+                size=10,
+                color=artist_metrics['Average Price'],
+                colorscale='Viridis',
+                showscale=True,
+                colorbar=dict(title="Average Price ($)")
+            )
+        ),
+        go.Scattergl(
+            x=top_labeled_artists['Number of Works'],
+            y=top_labeled_artists['Total Value'],
+            mode='text',
+            text=top_labeled_artists.index,
+            textposition="top center",
+            hoverinfo='skip'
         )
+    ])
+    fig_scatter_artist.update_layout(
+        height=500,
+        xaxis_title="Number of Works",
+        yaxis_title="Total Value ($)",
+        showlegend=False
     )
-])
-fig_scatter_artist.update_layout(
-    height=500,
-    xaxis_title="Number of Works",
-    yaxis_title="Total Value ($)",
-)
-st.plotly_chart(fig_scatter_artist, use_container_width=True)
-
-# Artist diversification analysis
-st.subheader("🎨 Artist Diversification by Galleries")
-fig_diversification = go.Figure(data=[go.Histogram(
-    x=artist_metrics['Number of Galleries'],
-    nbinsx=10,
-    name='Number of Artists',
-    hovertemplate="Galleries: %{x}<br>Number of Artists: %{y}"
-)])
-fig_diversification.update_layout(
-    xaxis_title="Number of Galleries Representing the Artist",
-    yaxis_title="Number of Artists",
-    showlegend=False,
-    height=400
-)
-st.plotly_chart(fig_diversification, use_container_width=True)
+    return fig_scatter_artist
 
-# Detailed table of artists in expander
-with st.expander("📋 View Complete Artist Details"):
-    st.dataframe(
-        artist_metrics.style.format({
-            'Total Value': '${:,.2f}',
-            'Average Price': '${:,.2f}',
-            'Number of Works': '{:,.0f}',
-            'Number of Galleries': '{:,.0f}'
-        }),
-        height=400
+@st.cache_resource
+def make_diversification_fig(galleries_centers, galleries_counts, galleries_widths, galleries_labels):
+    fig_diversification = go.Figure(data=[go.Bar(
+        x=galleries_centers,
+        y=galleries_counts,
+        width=galleries_widths,
+        customdata=galleries_labels,
+        name='Number of Artists',
+        hovertemplate="Galleries: %{customdata}<br>Number of Artists: %{y}"
+    )])
+    fig_diversification.update_layout(
+        xaxis_title="Number of Galleries Representing the Artist",
+        yaxis_title="Number of Artists",
+        **BAR_LAYOUT
     )
+    return fig_diversification
 
-# Time Trend Analysis
-st.header("📅 Time Analysis")
-
-# Prepare time data
-df['Year'] = pd.to_numeric(df['Year'], errors='coerce')
-year_stats = df.groupby('Year').agg({
-    'Average Price': ['mean', 'sum', 'count'],
-    'Artist': 'nunique',
-    'Gallery': 'nunique'
-}).round(2)
-year_stats.columns = ['Average Price', 'Total Value', 'Number of Works', 'Number of Artists', 'Number of Galleries']
-
-# Time metrics
-col_t1, col_t2, col_t3, col_t4 = st.columns(4)
-with col_t1:
-    growth_works = ((year_stats['Number of Works'].iloc[-1] / year_stats['Number of Works'].iloc[0]) - 1) * 100
-    st.metric("Growth in Works", f"{growth_works:.1f}%")
-with col_t2:
-    growth_price = ((year_stats['Average Price'].iloc[-1] / year_stats['Average Price'].iloc[0]) - 1) * 100
-    st.metric("Growth in Price", f"{growth_price:.1f}%")
-with col_t3:
-    growth_artists = ((year_stats['Number of Artists'].iloc[-1] / year_stats['Number of Artists'].iloc[0]) - 1) * 100
-    st.metric("Growth in Artists", f"{growth_artists:.1f}%")
-with col_t4:
-    growth_galleries = ((year_stats['Number of Galleries'].iloc[-1] / year_stats['Number of Galleries'].iloc[0]) - 1) * 100
-    st.metric("Growth in Galleries", f"{growth_galleries:.1f}%")
-
-# Time visualisations
-col_t5, col_t6 = st.columns(2)
-
-with col_t5:
-    st.subheader("📈 Price and Works Evolution")
+@st.cache_resource
+def make_temporal_fig(year_stats):
     fig_temporal = go.Figure()
-    
+
     # Add average price line
     fig_temporal.add_trace(
         go.Scatter(
@@ -389,7 +504,7 @@ with col_t5:
             yaxis='y1'
         )
     )
-    
+
     # Add works bar
     fig_temporal.add_trace(
         go.Bar(
@@ -401,7 +516,7 @@ with col_t5:
             opacity=0.7
         )
     )
-    
+
     fig_temporal.update_layout(
         yaxis=dict(
             title="Average Price ($)",
@@ -420,12 +535,12 @@ with col_t5:
         showlegend=True,
         height=400
     )
-    st.plotly_chart(fig_temporal, use_container_width=True)
+    return fig_temporal
 
-with col_t6:
-    st.subheader("📊 Artist and Gallery Growth")
+@st.cache_resource
+def make_participants_fig(year_stats):
     fig_participants = go.Figure()
-    
+
     # Add artist line
     fig_participants.add_trace(
         go.Scatter(
@@ -436,7 +551,7 @@ with col_t6:
             mode='lines+markers'
         )
     )
-    
+
     # Add gallery line
     fig_participants.add_trace(
         go.Scatter(
@@ -447,113 +562,363 @@ with col_t6:
             mode='lines+markers'
         )
     )
-    
+
     fig_participants.update_layout(
         yaxis_title="Number of Participants",
         xaxis_title="Year",
         hovermode='x unified',
         height=400
     )
-    st.plotly_chart(fig_participants, use_container_width=True)
+    return fig_participants
 
-# Detailed time table in expander
-with st.expander("📋 View Complete Details by Year"):
-    st.dataframe(
-        year_stats.style.format({
-            'Average Price': '${:,.2f}',
-            'Total Value': '${:,.2f}',
-            'Number of Works': '{:,.0f}',
-            'Number of Artists': '{:,.0f}',
-            'Number of Galleries': '{:,.0f}'
-        }),
-        height=400
-    )
-
-# Market Analysis
-st.header("🌎 Market Analysis")
-
-# Prepare segmentation data
-df['Price Segment'] = pd.qcut(
-    df['Average Price'],
-    q=4,
-    labels=['Basic', 'Medium', 'Premium', 'Ultra Premium']
-)
-
-premium_threshold = df['Average Price'].quantile(0.9)
-premium_works = df[df['Average Price'] > premium_threshold]
-
-# First row - Segmentation Metrics
-col_m1, col_m2, col_m3, col_m4 = st.columns(4)
-
-with col_m1:
-    average_price_premium = premium_works['Average Price'].mean()
-    st.metric("Average Price Premium", f"${average_price_premium:,.0f}")
-with col_m2:
-    obras_premium = len(premium_works)
-    st.metric("Premium Works (Top 10%)", f"{obras_premium:,}")
-with col_m3:
-    value_premium = premium_works['Average Price'].sum()
-    st.metric("Total Value Premium", f"${value_premium:,.0f}")
-with col_m4:
-    participation_premium = (value_premium / df['Average Price'].sum()) * 100
-    st.metric("% Value Premium", f"{participation_premium:.1f}%")
-
-# Second row - Segment Analysis
-col_m5, col_m6 = st.columns(2)
-
-with col_m5:
-    st.subheader("📊 Distribution by Price Segment")
-    segment_stats = df.groupby('Price Segment').agg({
-        'Average Price': ['count', 'mean', 'sum']
-    }).round(2)
-    segment_stats.columns = ['Number of Works', 'Average Price', 'Total Value']
-    
-    # Calculate percentages
-    segment_stats['% Works'] = (segment_stats['Number of Works'] / segment_stats['Number of Works'].sum()) * 100
-    segment_stats['% Value'] = (segment_stats['Total Value'] / segment_stats['Total Value'].sum()) * 100
-    
+@st.cache_resource
+def make_segments_fig(segment_stats):
     fig_segments = go.Figure(data=[
         go.Bar(
             name='% Works',
             x=segment_stats.index,
             y=segment_stats['% Works'],
-            text=segment_stats['% Works'].apply(lambda x: f'{x:.1f}%'),
+            texttemplate='%{y:.1f}%',
             textposition='auto',
         ),
         go.Bar(
             name='% Value',
             x=segment_stats.index,
             y=segment_stats['% Value'],
-            text=segment_stats['% Value'].apply(lambda x: f'{x:.1f}%'),
+            texttemplate='%{y:.1f}%',
             textposition='auto',
         )
     ])
-    
+
     fig_segments.update_layout(
         barmode='group',
         xaxis_title="Segment",
         yaxis_title="Percentage (%)",
         height=400
     )
-    st.plotly_chart(fig_segments, use_container_width=True)
+    return fig_segments
 
-with col_m6:
-    st.subheader("💰 Average Price by Segment")
+@st.cache_resource
+def make_price_segment_fig(segment_stats):
     fig_price_segment = go.Figure(data=[
         go.Bar(
             x=segment_stats.index,
             y=segment_stats['Average Price'],
-            text=segment_stats['Average Price'].apply(lambda x: f'${x:,.0f}'),
+            texttemplate='$%{y:,.0f}',
             textposition='auto',
         )
     ])
-    
+
     fig_price_segment.update_layout(
         xaxis_title="Segment",
         yaxis_title="Average Price ($)",
-        showlegend=False,
+        **BAR_LAYOUT
+    )
+    return fig_price_segment
+
+@st.cache_resource
+def make_regions_fig(region_stats):
+    fig_regions = go.Figure(data=[
+        go.Pie(
+            labels=region_stats.index,
+            values=region_stats['Total Value'],
+            textinfo='label+percent',
+            hovertemplate="Country: %{label}<br>Total Value: $%{value:,.0f}<br>Percentage: %{percent}"
+        )
+    ])
+
+    fig_regions.update_layout(height=400)
+    return fig_regions
+
+@st.cache_resource
+def make_price_country_fig(region_stats):
+    fig_price_country = go.Figure(data=[
+        go.Bar(
+            x=region_stats.index,
+            y=region_stats['Average Price'],
+            texttemplate='$%{y:,.0f}',
+            textposition='auto',
+        )
+    ])
+
+    fig_price_country.update_layout(
+        xaxis_title="Country",
+        yaxis_title="Average Price ($)",
+        **BAR_LAYOUT
+    )
+    return fig_price_country
+
+@st.cache_resource
+def make_artist_type_fig(artist_type_stats):
+    fig_artist_type = go.Figure(data=[
+        go.Pie(
+            labels=artist_type_stats.index,
+            values=artist_type_stats['Total Value'],
+            textinfo='label+percent',
+            hovertemplate="Type: %{label}<br>Total Value: $%{value:,.0f}<br>Percentage: %{percent}"
+        )
+    ])
+
+    fig_artist_type.update_layout(height=400)
+    return fig_artist_type
+
+@st.cache_resource
+def make_sales_fig(sold_works, total_works):
+    fig_sales = go.Figure(data=[
+        go.Pie(
+            labels=['Sold', 'Not Sold'],
+            values=[sold_works, total_works - sold_works],
+            textinfo='label+percent',
+            hole=.3
+        )
+    ])
+
+    fig_sales.update_layout(
+        title="Sales Status",
         height=400
     )
+    return fig_sales
+
+
+df, counts = load_data()
+prices = df['Average Price'].to_numpy()
+prices.flags.writeable = False
+summary = compute_summary(df)
+filter_choices = filter_options(df)
+
+# Main KPIs Section
+st.header("📊 Key Market Metrics")
+
+# First row of KPIs - General Metrics
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("Total Works", f"{counts['works']:,}")
+with col2:
+    st.metric("Total Artists", f"{counts['artists']:,}")
+with col3:
+    st.metric("Total Galleries", f"{counts['galleries']:,}")
+with col4:
+    st.metric("Total Volume", f"${summary['total']:,.0f}")
+
+# Second row - Price Metrics
+col5, col6, col7, col8 = st.columns(4)
+with col5:
+    st.metric("Average Price", f"${summary['mean']:,.0f}")
+with col6:
+    st.metric("Median Price", f"${summary['median']:,.0f}")
+with col7:
+    st.metric("Minimum Price", f"${summary['min']:,.0f}")
+with col8:
+    st.metric("Maximum Price", f"${summary['max']:,.0f}")
+
+# Third row - Dispersion Metrics and Ratios
+col9, col10, col11, col12 = st.columns(4)
+with col9:
+    st.metric("Standard Deviation", f"${summary['std']:,.0f}")
+with col10:
+    works_per_artist = counts['works'] / counts['artists']
+    st.metric("Works per Artist", f"{works_per_artist:.1f}")
+with col11:
+    works_per_gallery = counts['works'] / counts['galleries']
+    st.metric("Works per Gallery", f"{works_per_gallery:.1f}")
+with col12:
+    value_per_work = summary['total'] / counts['works']
+    st.metric("Value per Work", f"${value_per_work:,.0f}")
+
+# Price Distribution
+st.subheader("📈 Price Distribution")
+# Create histogram with plotly
+price_centers, price_counts, price_widths, price_ranges = compute_histogram(df['Average Price'], 30)
+fig_histogram = make_price_histogram_fig(price_centers, price_counts, price_widths, price_ranges, summary)
+st.plotly_chart(fig_histogram, use_container_width=True)
+
+# Gallery Analysis
+st.header("🏢 Gallery Analysis")
+
+# Prepare aggregated gallery data (once)
+gallery_metrics = compute_gallery_metrics(df)
+
+# Main gallery visualisations
+top_galleries = gallery_metrics.nlargest(10, 'Total Value')
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("💰 Top 10 Galleries by Total Value")
+    fig_top_galleries = make_top_galleries_fig(top_galleries)
+    st.plotly_chart(fig_top_galleries, use_container_width=True)
+
+with col2:
+    st.subheader("📊 Works and Artists per Gallery")
+    fig_works_artists = make_works_artists_fig(top_galleries)
+    st.plotly_chart(fig_works_artists, use_container_width=True)
+
+# Gallery summary metrics
+gallery_means = gallery_metrics[['Number of Works', 'Number of Artists', 'Total Value', 'Works per Artist']].mean()
+col3, col4, col5, col6 = st.columns(4)
+with col3:
+    st.metric("Average Works/Gallery", f"{gallery_means['Number of Works']:.1f}")
+with col4:
+    st.metric("Average Artists/Gallery", f"{gallery_means['Number of Artists']:.1f}")
+with col5:
+    st.metric("Average Value/Gallery", f"${gallery_means['Total Value']:,.0f}")
+with col6:
+    st.metric("Average Works/Artist", f"{gallery_means['Works per Artist']:.1f}")
+
+# Scatter plot of Works vs Total Value relationship
+st.subheader("📈 Relationship between Number of Works and Total Value")
+fig_scatter = make_gallery_scatter_fig(gallery_metrics)
+st.plotly_chart(fig_scatter, use_container_width=True)
+
+# Detailed table in expander
+with st.expander("📋 View Complete Gallery Details"):
+    st.dataframe(
+        gallery_metrics.sort_values('Total Value', ascending=False),
+        column_config={
+            'Total Value': MONEY_COLUMN,
+            'Average Price': MONEY_COLUMN,
+            'Number of Works': COUNT_COLUMN,
+            'Number of Artists': COUNT_COLUMN,
+            'Works per Artist': RATIO_COLUMN
+        },
+        height=400
+    )
+
+# Artist Analysis
+st.header("👨‍🎨 Artist Analysis")
+
+# Prepare aggregated artist data
+artist_metrics = compute_artist_metrics(df)
+
+# Artist summary metrics
+artist_means = artist_metrics[['Number of Works', 'Number of Galleries', 'Total Value']].mean()
+col_a1, col_a2, col_a3, col_a4 = st.columns(4)
+with col_a1:
+    st.metric("Average Works/Artist", f"{artist_means['Number of Works']:.1f}")
+with col_a2:
+    st.metric("Average Galleries/Artist", f"{artist_means['Number of Galleries']:.1f}")
+with col_a3:
+    st.metric("Average Value/Artist", f"${artist_means['Total Value']:,.0f}")
+with col_a4:
+    artists_exclusive = len(artist_metrics[artist_metrics['Number of Galleries'] == 1])
+    st.metric("Exclusive Artists", f"{artists_exclusive:,}")
+
+# Main artist visualisations
+top_artists = artist_metrics.nlargest(10, 'Total Value')
+col_a5, col_a6 = st.columns(2)
+
+with col_a5:
+    st.subheader("💰 Top 10 Artists by Total Value")
+    fig_top_artists = make_top_artists_fig(top_artists)
+    st.plotly_chart(fig_top_artists, use_container_width=True)
+
+with col_a6:
+    st.subheader("📊 Distribution of Works per Artist")
+    works_centers, works_counts, works_widths, works_labels = compute_count_histogram(artist_metrics['Number of Works'], 20)
+    fig_works_per_artist = make_works_per_artist_fig(works_centers, works_counts, works_widths, works_labels)
+    st.plotly_chart(fig_works_per_artist, use_container_width=True)
+
+# Scatter plot of Works vs Total Value relationship for artists
+st.subheader("📈 Relationship between Number of Works and Total Value per Artist")
+fig_scatter_artist = make_artist_scatter_fig(artist_metrics)
+st.plotly_chart(fig_scatter_artist, use_container_width=True)
+
+# Artist diversification analysis
+st.subheader("🎨 Artist Diversification by Galleries")
+galleries_centers, galleries_counts, galleries_widths, galleries_labels = compute_count_histogram(artist_metrics['Number of Galleries'], 10)
+fig_diversification = make_diversification_fig(galleries_centers, galleries_counts, galleries_widths, galleries_labels)
+st.plotly_chart(fig_diversification, use_container_width=True)
+
+# Detailed table of artists in expander
+with st.expander("📋 View Complete Artist Details"):
+    st.dataframe(
+        artist_metrics.sort_values('Total Value', ascending=False),
+        column_config={
+            'Total Value': MONEY_COLUMN,
+            'Average Price': MONEY_COLUMN,
+            'Number of Works': COUNT_COLUMN,
+            'Number of Galleries': COUNT_COLUMN
+        },
+        height=400
+    )
+
+# Time Trend Analysis
+st.header("📅 Time Analysis")
+
+# Prepare time data
+year_stats = compute_year_stats(df)
+
+# Time metrics (first vs last year, all columns at once)
+first, last = year_stats.to_numpy()[[0, -1]]
+growth = dict(zip(year_stats.columns, ((last / first) - 1) * 100))
+col_t1, col_t2, col_t3, col_t4 = st.columns(4)
+with col_t1:
+    st.metric("Growth in Works", f"{growth['Number of Works']:.1f}%")
+with col_t2:
+    st.metric("Growth in Price", f"{growth['Average Price']:.1f}%")
+with col_t3:
+    st.metric("Growth in Artists", f"{growth['Number of Artists']:.1f}%")
+with col_t4:
+    st.metric("Growth in Galleries", f"{growth['Number of Galleries']:.1f}%")
+
+# Time visualisations
+col_t5, col_t6 = st.columns(2)
+
+with col_t5:
+    st.subheader("📈 Price and Works Evolution")
+    fig_temporal = make_temporal_fig(year_stats)
+    st.plotly_chart(fig_temporal, use_container_width=True)
+
+with col_t6:
+    st.subheader("📊 Artist and Gallery Growth")
+    fig_participants = make_participants_fig(year_stats)
+    st.plotly_chart(fig_participants, use_container_width=True)
+
+# Detailed time table in expander
+with st.expander("📋 View Complete Details by Year"):
+    st.dataframe(
+        year_stats,
+        column_config={
+            'Average Price': MONEY_COLUMN,
+            'Total Value': MONEY_COLUMN,
+            'Number of Works': COUNT_COLUMN,
+            'Number of Artists': COUNT_COLUMN,
+            'Number of Galleries': COUNT_COLUMN
+        },
+        height=400
+    )
+
+# Market Analysis
+st.header("🌎 Market Analysis")
+
+# Prepare segmentation data
+premium_stats = compute_premium_stats(df)
+
+# First row - Segmentation Metrics
+col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+
+with col_m1:
+    st.metric("Average Price Premium", f"${premium_stats['mean']:,.0f}")
+with col_m2:
+    st.metric("Premium Works (Top 10%)", f"{premium_stats['count']:,}")
+with col_m3:
+    st.metric("Total Value Premium", f"${premium_stats['total']:,.0f}")
+with col_m4:
+    participation_premium = (premium_stats['total'] / summary['total']) * 100
+    st.metric("% Value Premium", f"{participation_premium:.1f}%")
+
+# Second row - Segment Analysis
+col_m5, col_m6 = st.columns(2)
+
+with col_m5:
+    st.subheader("📊 Distribution by Price Segment")
+    segment_stats = compute_segment_stats(df)
+    
+    fig_segments = make_segments_fig(segment_stats)
+    st.plotly_chart(fig_segments, use_container_width=True)
+
+with col_m6:
+    st.subheader("💰 Average Price by Segment")
+    fig_price_segment = make_price_segment_fig(segment_stats)
     st.plotly_chart(fig_price_segment, use_container_width=True)
 
 # Regional Analysis if country column exists
@@ -561,48 +926,19 @@ if 'Country' in df.columns:
     st.subheader("🌍 Regional Analysis")
     
     # Prepare regional data
-    region_stats = df.groupby('Country').agg({
-        'Average Price': ['count', 'mean', 'sum'],
-        'Artist': 'nunique',
-        'Gallery': 'nunique'
-    }).round(2)
-    region_stats.columns = ['Number of Works', 'Average Price', 'Total Value', 'Number of Artists', 'Number of Galleries']
+    region_stats = compute_region_stats(df)
     
     col_m7, col_m8 = st.columns(2)
     
     with col_m7:
         st.subheader("📊 Participation by Country")
-        region_stats['% Value'] = (region_stats['Total Value'] / region_stats['Total Value'].sum()) * 100
         
-        fig_regions = go.Figure(data=[
-            go.Pie(
-                labels=region_stats.index,
-                values=region_stats['Total Value'],
-                textinfo='label+percent',
-                hovertemplate="Country: %{label}<br>Total Value: $%{value:,.0f}<br>Percentage: %{percent}"
-            )
-        ])
-        
-        fig_regions.update_layout(height=400)
+        fig_regions = make_regions_fig(region_stats)
         st.plotly_chart(fig_regions, use_container_width=True)
     
     with col_m8:
         st.subheader("🎨 Average Price by Country")
-        fig_price_country = go.Figure(data=[
-            go.Bar(
-                x=region_stats.index,
-                y=region_stats['Average Price'],
-                text=region_stats['Average Price'].apply(lambda x: f'${x:,.0f}'),
-                textposition='auto',
-            )
-        ])
-        
-        fig_price_country.update_layout(
-            xaxis_title="Country",
-            yaxis_title="Average Price ($)",
-            showlegend=False,
-            height=400
-        )
+        fig_price_country = make_price_country_fig(region_stats)
         st.plotly_chart(fig_price_country, use_container_width=True)
 
 # Artist Type Analysis if type column exists
@@ -610,40 +946,27 @@ if 'Artist Type' in df.columns:
     st.subheader("👨‍🎨 Artist Type Analysis")
     
     # Prepare type data
-    artist_type_stats = df.groupby('Artist Type').agg({
-        'Average Price': ['count', 'mean', 'sum'],
-        'Artist': 'nunique'
-    }).round(2)
-    artist_type_stats.columns = ['Number of Works', 'Average Price', 'Total Value', 'Number of Artists']
+    artist_type_stats = compute_artist_type_stats(df)
     
     col_m9, col_m10 = st.columns(2)
     
     with col_m9:
         st.subheader("📊 Distribution by Artist Type")
-        artist_type_stats['% Value'] = (artist_type_stats['Total Value'] / artist_type_stats['Total Value'].sum()) * 100
-        
-        fig_artist_type = go.Figure(data=[
-            go.Pie(
-                labels=artist_type_stats.index,
-                values=artist_type_stats['Total Value'],
-                textinfo='label+percent',
-                hovertemplate="Type: %{label}<br>Total Value: $%{value:,.0f}<br>Percentage: %{percent}"
-            )
-        ])
         
-        fig_artist_type.update_layout(height=400)
+        fig_artist_type = make_artist_type_fig(artist_type_stats)
         st.plotly_chart(fig_artist_type, use_container_width=True)
     
     with col_m10:
         st.subheader("💰 Artist Type Metrics")
         st.dataframe(
-            artist_type_stats.style.format({
-                'Number of Works': '{:,.0f}',
-                'Average Price': '${:,.2f}',
-                'Total Value': '${:,.2f}',
-                'Number of Artists': '{:,.0f}',
-                '% Value': '{:.1f}%'
-            }),
+            artist_type_stats,
+            column_config={
+                'Number of Works': COUNT_COLUMN,
+                'Average Price': MONEY_COLUMN,
+                'Total Value': MONEY_COLUMN,
+                'Number of Artists': COUNT_COLUMN,
+                '% Value': PERCENT_COLUMN
+            },
             height=400
         )
 
@@ -652,48 +975,35 @@ if 'Sales Status' in df.columns:
     st.subheader("📦 Sales Analysis")
     
     # Prepare sales data
-    sales_stats = df.groupby('Sales Status').agg({
-        'Average Price': ['count', 'mean', 'sum']
-    }).round(2)
-    sales_stats.columns = ['Number of Works', 'Average Price', 'Total Value']
+    sales_stats = compute_sales_stats(df)
     
     col_m11, col_m12 = st.columns(2)
     
     with col_m11:
-        total_works = len(df)
-        sold_works = len(df[df['Sales Status'] == 'Sold'])
+        total_works = counts['works']
+        # Counted on rows (the table's Number of Works skips unpriced works)
+        sold_works = int(category_mask(df['Sales Status'], ['Sold']).sum())
         sales_rate = (sold_works / total_works) * 100
         
-        fig_sales = go.Figure(data=[
-            go.Pie(
-                labels=['Sold', 'Not Sold'],
-                values=[sold_works, total_works - sold_works],
-                textinfo='label+percent',
-                hole=.3
-            )
-        ])
-        
-        fig_sales.update_layout(
-            title="Sales Status",
-            height=400
-        )
+        fig_sales = make_sales_fig(sold_works, total_works)
         st.plotly_chart(fig_sales, use_container_width=True)
     
     with col_m12:
         st.metric("Sales Rate", f"{sales_rate:.1f}%")
         st.metric("Sold Works", f"{sold_works:,}")
-        st.metric("Total Sold Value", f"${sales_stats.loc['Sold', 'Total Value']:,.0f}")
+        st.metric("Total Sold Value", f"${sales_stats['Total Value'].get('Sold', 0):,.0f}")
 
 # Detailed segment table in expander
 with st.expander("📋 View Complete Details by Segment"):
     st.dataframe(
-        segment_stats.style.format({
-            'Number of Works': '{:,.0f}',
-            'Average Price': '${:,.2f}',
-            'Total Value': '${:,.2f}',
-            '% Works': '{:.1f}%',
-            '% Value': '{:.1f}%'
-        }),
+        segment_stats,
+        column_config={
+            'Number of Works': COUNT_COLUMN,
+            'Average Price': MONEY_COLUMN,
+            'Total Value': MONEY_COLUMN,
+            '% Works': PERCENT_COLUMN,
+            '% Value': PERCENT_COLUMN
+        },
         height=400
     )
 
@@ -713,14 +1023,14 @@ with st.container():
         st.subheader("🏢 Gallery Filter")
         selected_gallery = st.multiselect(
             "Select Galleries",
-            options=sorted(df['Gallery'].unique()),
+            options=filter_choices['Gallery'],
             default=[]
         )
     
     with col_f2:
         st.subheader("💰 Price Range Filter")
-        min_price = float(df['Average Price'].min())
-        max_price = float(df['Average Price'].max())
+        min_price = float(summary['min'])
+        max_price = float(summary['max'])
         price_range = st.slider(
             "Select Price Range",
             min_value=min_price,
@@ -735,7 +1045,7 @@ with st.container():
         st.subheader("📊 Segment Filter")
         selected_price_range = st.multiselect(
             "Select Price Segments",
-            options=sorted(df['Price Segment'].unique()),
+            options=filter_choices['Price Segment'],
             default=[]
         )
 
@@ -747,7 +1057,7 @@ with st.container():
             st.subheader("🌍 Country Filter")
             selected_country = st.multiselect(
                 "Select Countries",
-                options=sorted(df['Country'].unique()),
+                options=filter_choices['Country'],
                 default=[]
             )
     
@@ -756,7 +1066,7 @@ with st.container():
             st.subheader("👨‍🎨 Artist Type Filter")
             selected_artist_type = st.multiselect(
                 "Select Artist Types",
-                options=sorted(df['Artist Type'].unique()),
+                options=filter_choices['Artist Type'],
                 default=[]
             )
     
@@ -765,54 +1075,55 @@ with st.container():
             st.subheader("📦 Sales Status Filter")
             selected_sale_status = st.multiselect(
                 "Select Sales Status",
-                options=sorted(df['Sales Status'].unique()),
+                options=filter_choices['Sales Status'],
                 default=[]
             )
 
-# Apply filters
-mask = pd.Series(True, index=df.index)
+# Apply filters (collect boolean arrays for active filters and AND them once)
+conditions = [np.logical_and(prices >= price_range[0], prices <= price_range[1])]
 
 if selected_gallery:
-    mask &= df['Gallery'].isin(selected_gallery)
-
-mask &= (df['Average Price'] >= price_range[0]) & (df['Average Price'] <= price_range[1])
+    conditions.append(category_mask(df['Gallery'], selected_gallery))
 
 if selected_price_range:
-    mask &= df['Price Segment'].isin(selected_price_range)
+    conditions.append(category_mask(df['Price Segment'], selected_price_range))
 
 if 'Country' in df.columns and selected_country:
-    mask &= df['Country'].isin(selected_country)
+    conditions.append(category_mask(df['Country'], selected_country))
 
 if 'Artist Type' in df.columns and selected_artist_type:
-    mask &= df['Artist Type'].isin(selected_artist_type)
+    conditions.append(category_mask(df['Artist Type'], selected_artist_type))
 
 if 'Sales Status' in df.columns and selected_sale_status:
-    mask &= df['Sales Status'].isin(selected_sale_status)
+    conditions.append(category_mask(df['Sales Status'], selected_sale_status))
 
-df_filtered = df[mask]
+mask = np.logical_and.reduce(conditions)
 
 # Show filter summary
 st.subheader("📊 Filter Summary")
 col_f7, col_f8, col_f9, col_f10 = st.columns(4)
 
 with col_f7:
-    st.metric("Selected Works", f"{len(df_filtered):,}")
+    st.metric("Selected Works", f"{int(mask.sum()):,}")
 with col_f8:
-    st.metric("Selected Galleries", f"{df_filtered['Gallery'].nunique():,}")
+    st.metric("Selected Galleries", f"{count_unique(df['Gallery'], mask):,}")
 with col_f9:
-    st.metric("Selected Artists", f"{df_filtered['Artist'].nunique():,}")
+    st.metric("Selected Artists", f"{count_unique(df['Artist'], mask):,}")
 with col_f10:
-    filtered_value = df_filtered['Average Price'].sum()
+    filtered_value = prices[mask].sum(dtype=np.float64)
     st.metric("Filtered Total Value", f"${filtered_value:,.0f}")
 
 # Show filtered data
 st.subheader("🎨 Filtered Works")
 with st.expander("View Filtered Data", expanded=True):
+    # Only the table needs the filtered rows as a frame
+    df_filtered = df[mask]
     st.dataframe(
-        df_filtered.style.format({
-            'Minimum Price': '${:,.2f}',
-            'Maximum Price': '${:,.2f}',
-            'Average Price': '${:,.2f}'
-        }),
+        df_filtered,
+        column_config={
+            'Minimum Price': MONEY_COLUMN,
+            'Maximum Price': MONEY_COLUMN,
+            'Average Price': MONEY_COLUMN
+        },
         height=400
     ) 
\ No newline at end of file